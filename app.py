@@ -1,5 +1,7 @@
-import glob
+import os
 from pathlib import Path
+import numpy as np
+import orjson
 import pandas as pd
 import streamlit as st
 
@@ -8,8 +10,7 @@ import streamlit as st
 # -------------------------
 st.set_page_config(page_title="SPL Dashboard", layout="wide")
 
-st.markdown(
-    """
+_CSS = """
 <style>
 /* Keep header visible so the sidebar toggle exists */
 header[data-testid="stHeader"] { position: sticky; top: 0; z-index: 999; }
@@ -50,9 +51,17 @@ section[data-testid="stSidebar"] > div {
 .table-wrap td { padding: 8px 6px; border-bottom: 1px solid rgba(0,0,0,0.07); font-size: 13px; }
 .right { text-align: right; }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def _inject_css() -> None:
+    # Static block: cache_resource makes this a one-shot, replayed from the
+    # cache on reruns instead of re-diffed through the element tree.
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+
+_inject_css()
 
 
 ROOT = Path(__file__).resolve().parent
@@ -61,99 +70,344 @@ DATA = ROOT / "data"
 DASH_DIR = DATA / "dashboard_table_csv"
 FIXTURE_DIR = DATA / "match_level_fixtures"
 
+# Parquet copies written by Load.ipynb (preferred: typed + faster to read)
+DASH_PARQUET_DIR = DATA / "dashboard_table_parquet"
+FIXTURE_PARQUET_DIR = DATA / "match_level_fixtures_parquet"
+
+# Stable single-file copies promoted by Load.ipynb — no folder listing at all
+DASH_PARQUET_FILE = DATA / "dashboard.parquet"
+FIXTURE_PARQUET_FILE = DATA / "fixtures.parquet"
+
+# Only the columns each view actually consumes get parsed/loaded
+DASH_COLS = ("team", "pts", "gf", "ga", "gd", "spi", "exp_pts_mc", "exp_pts_final_mc", "win_league_pct", "make_acl_pct")
+FIXTURE_COLS = ("event_id", "match_date", "team", "opponent", "venue", "p_win", "p_draw", "p_loss", "exp_pts", "xg_for", "xg_against")
+
 
 # -------------------------
 # Helpers
 # -------------------------
+def _dir_signature(folder: Path) -> tuple[str, int]:
+    """Cheap cache key: one stat() on the directory itself."""
+    try:
+        return (str(folder), folder.stat().st_mtime_ns)
+    except OSError:
+        return (str(folder), -1)
+
+
+@st.cache_data(show_spinner=False)
+def _largest_part_path(folder: str, dir_mtime_ns: int) -> str | None:
+    # One scandir pass: DirEntry.stat() reuses the directory read on most OSes,
+    # so we avoid glob's fnmatch plus a second stat() per file.
+    best = None
+    best_size = -1
+    with os.scandir(folder) as it:
+        for entry in it:
+            name = entry.name
+            # name checks alone drop _SUCCESS, .crc and hidden files before
+            # any stat happens
+            if not name.startswith("part-") or name.endswith(".crc"):
+                continue
+            if name.endswith(".csv.parquet"):
+                # transcoded sidecar (see _read_spark_output), not a Spark part
+                continue
+            size = entry.stat(follow_symlinks=False).st_size
+            if size > best_size:
+                best_size, best = size, entry.path
+
+    return best
+
+
 def _latest_spark_part(folder: Path) -> Path | None:
     """
     Spark writes folder/part-0000... (sometimes without .csv extension),
     plus _SUCCESS and *.crc files. This returns the largest non-crc part file.
+    Memoized on the directory's mtime, so a new Spark write (which touches
+    the folder) is the only thing that triggers a re-scan.
     """
     if not folder.exists():
         return None
 
-    files = sorted(glob.glob(str(folder / "part-*")))
-    files = [f for f in files if not f.endswith(".crc")]
-    if not files:
-        return None
+    best = _largest_part_path(*_dir_signature(folder))
+    return Path(best) if best is not None else None
 
-    files_p = [Path(f) for f in files]
-    return max(files_p, key=lambda p: p.stat().st_size)
 
+def _data_file(stable_fp: Path, parquet_dir: Path, csv_dir: Path) -> Path | None:
+    """
+    Prefer the stable single-file Parquet export (one stat(), no listing),
+    then the Parquet folder, then the CSV folder.
+    """
+    if stable_fp.exists():
+        return stable_fp
+    return _latest_spark_part(parquet_dir) or _latest_spark_part(csv_dir)
+
+
+def _read_spark_output(fp: Path, columns: tuple[str, ...]) -> pd.DataFrame:
+    if fp.suffix == ".parquet":
+        # Projection pushdown: check the footer schema (cheap) and only
+        # materialize the columns the view consumes.
+        import pyarrow.parquet as pq
+
+        present = [c for c in columns if c in pq.read_schema(fp).names]
+        return pd.read_parquet(fp, engine="pyarrow", columns=present)
+
+    # CSV fallback: transcode to a .parquet sidecar on first read and reuse it
+    # while it is at least as new as the CSV — later cold loads skip CSV
+    # tokenizing and type inference entirely.
+    sidecar = Path(str(fp) + ".parquet")
+    try:
+        if sidecar.exists() and sidecar.stat().st_mtime >= fp.stat().st_mtime:
+            return pd.read_parquet(sidecar, engine="pyarrow")
+    except OSError:
+        pass
+
+    # pyarrow's CSV parser is multi-threaded, unlike pandas' default engine.
+    # Prune to the consumed columns right after parse (the CSV header isn't
+    # known up front, so a usecols list could raise on older exports).
+    df = pd.read_csv(fp, engine="pyarrow")
+    df = df[[c for c in columns if c in df.columns]]
+    try:
+        df.to_parquet(sidecar, engine="pyarrow", index=False)
+    except OSError:
+        pass
+    return df
 
-@st.cache_data(show_spinner=False)
-def load_dashboard() -> pd.DataFrame | None:
-    fp = _latest_spark_part(DASH_DIR)
-    if fp is None:
-        return None
-    return pd.read_csv(fp)
 
+# cache_resource: the frames are shared references, not re-pickled/copied on
+# every cache hit like cache_data. Callers that mutate take a shallow copy
+# first and only ever replace whole columns, so the shared buffers stay clean.
+# (fp, mtime) form the cache key: a new Spark export bumps the part file's
+# mtime and actually reloads the frame instead of serving the stale one.
+@st.cache_resource(show_spinner=False)
+def load_dashboard(fp: str, mtime: int) -> pd.DataFrame:
+    df = _read_spark_output(Path(fp), DASH_COLS)
+    if "team" in df.columns:
+        # Normalize once here so update paths never re-run .str methods.
+        df["team"] = df["team"].astype("string").str.strip().astype("category")
+    return df
 
-@st.cache_data(show_spinner=False)
-def load_fixtures() -> pd.DataFrame | None:
-    fp = _latest_spark_part(FIXTURE_DIR)
-    if fp is None:
-        return None
-    return pd.read_csv(fp)
 
+@st.cache_resource(show_spinner=False)
+def load_fixtures(fp: str, mtime: int) -> pd.DataFrame:
+    fixtures = _read_spark_output(Path(fp), FIXTURE_COLS)
+
+    # Low-cardinality strings -> category: filters/groupby compare int8 codes
+    # instead of Python string objects. Venue is normalized to bare H/A here
+    # so downstream comparisons never re-run .str methods.
+    if "venue" in fixtures.columns:
+        fixtures["venue"] = fixtures["venue"].astype("string").str.strip().str.upper()
+    for c in ("team", "opponent", "venue"):
+        if c in fixtures.columns:
+            fixtures[c] = fixtures[c].astype("category")
+
+    return fixtures
+
+
+def to_pct_vec(s: pd.Series) -> pd.Series:
+    """Accepts 0-1 or 0-100 values column-wise, returns 0-100 floats (NaN kept)."""
+    s = pd.to_numeric(s, errors="coerce")
+    return pd.Series(np.where(s <= 1.0, s * 100.0, s), index=s.index).where(s.notna())
 
-def to_pct(x):
-    """Accepts 0-1 or 0-100. Returns 0-100 float."""
-    if pd.isna(x):
-        return None
-    x = float(x)
-    return x * 100 if x <= 1.0 else x
 
+VENUE_MAP = {"H": "Home", "A": "Away"}
 
-def prob_bar(pw, pdw, pl):
-    pw = to_pct(pw) or 0.0
-    pdw = to_pct(pdw) or 0.0
-    pl = to_pct(pl) or 0.0
-    s = max(pw + pdw + pl, 1e-9)
-    pw, pdw, pl = pw / s * 100, pdw / s * 100, pl / s * 100
 
-    return (
+def prob_bars(pw_arr, pdw_arr, pl_arr) -> list[str]:
+    """Build every probbar div from already-normalized 0-100 width arrays."""
+    return [
         f'<div class="probbar">'
-        f'<div class="win" style="width:{pw:.2f}%"></div>'
-        f'<div class="draw" style="width:{pdw:.2f}%"></div>'
-        f'<div class="loss" style="width:{pl:.2f}%"></div>'
+        f'<div class="win" style="width:{w:.2f}%"></div>'
+        f'<div class="draw" style="width:{d:.2f}%"></div>'
+        f'<div class="loss" style="width:{l:.2f}%"></div>'
         f'</div>'
-    )
+        for w, d, l in zip(pw_arr, pdw_arr, pl_arr)
+    ]
 
 
-def safe_num(df: pd.DataFrame, col: str) -> pd.DataFrame:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+def safe_num(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Coerce every listed column that exists to numeric in one fused pass."""
+    present = [c for c in cols if c in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors="coerce")
     return df
 
 
 # -------------------------
-# Sidebar navigation
+# Demo: fold uploaded EventMin JSON into the league table
 # -------------------------
-page = st.sidebar.radio("View", ["Power Ranking", "Fixtures"], index=0)
+def _parse_uploaded_json_files(files) -> list[dict]:
+    """Each uploaded file holds one EventMin/StatsMin payload, a list of
+    them, or JSON-lines with one payload per line."""
+    records: list[dict] = []
+    for f in files or []:
+        # orjson takes the raw bytes directly — no intermediate UTF-8
+        # decode pass over the payload.
+        raw = f.getvalue()
+        try:
+            payload = orjson.loads(raw)
+        except Exception:
+            # orjson rejects multi-document input, so this is likely
+            # JSON-lines: pyarrow decodes it columnar in one C pass.
+            try:
+                import io
+
+                import pyarrow.json as pj
+
+                payload = pj.read_json(io.BytesIO(raw)).to_pylist()
+            except Exception:
+                continue
+        if isinstance(payload, list):
+            records.extend(p for p in payload if isinstance(p, dict))
+        elif isinstance(payload, dict):
+            records.append(payload)
+    return records
+
+
+def _cached_upload_frame(state_key: str, files, builder):
+    """
+    Parse + aggregate uploaded payloads once per upload, not once per rerun.
+    Widget interactions rerun the whole script, so without this the same
+    files would be re-parsed and re-aggregated on every click. The result is
+    keyed in st.session_state on the uploaded (name, size) pairs.
+    """
+    if not files:
+        st.session_state.pop(state_key, None)
+        return None
+    sig = tuple((f.name, f.size) for f in files)
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    frame = builder(_parse_uploaded_json_files(files))
+    st.session_state[state_key] = (sig, frame)
+    return frame
+
+
+def _event_deltas(events: list[dict]) -> pd.DataFrame | None:
+    """
+    Aggregate finished EventMin records (status_code == 100) into per-team
+    pts/gf/ga deltas: one groupby over a stacked home+away frame. Returns a
+    team-indexed frame, or None if nothing usable was uploaded.
+    """
+    if not events:
+        return None
+
+    ev = pd.DataFrame(events)
+    needed = {"event_id", "home_team", "away_team", "home_score", "away_score", "status_code"}
+    if not needed.issubset(ev.columns):
+        return None
+
+    ev = ev[pd.to_numeric(ev["status_code"], errors="coerce") == 100].drop_duplicates("event_id")
+    hs = pd.to_numeric(ev["home_score"], errors="coerce")
+    aws = pd.to_numeric(ev["away_score"], errors="coerce")
+    ok = hs.notna() & aws.notna() & ev["home_team"].notna() & ev["away_team"].notna()
+    ev, hs, aws = ev[ok], hs[ok], aws[ok]
+    if ev.empty:
+        return None
+
+    hp = np.where(hs > aws, 3, np.where(hs < aws, 0, 1))
+    ap = np.where(aws > hs, 3, np.where(aws < hs, 0, 1))
+
+    long = pd.concat(
+        [
+            pd.DataFrame({"team": ev["home_team"].astype(str).str.strip(), "pts": hp, "gf": hs.to_numpy(), "ga": aws.to_numpy()}),
+            pd.DataFrame({"team": ev["away_team"].astype(str).str.strip(), "pts": ap, "gf": aws.to_numpy(), "ga": hs.to_numpy()}),
+        ]
+    )
+    return long.groupby("team")[["pts", "gf", "ga"]].sum()
+
+
+def _apply_eventmin_updates(df: pd.DataFrame, deltas: pd.DataFrame) -> pd.DataFrame:
+    """Fold pre-aggregated per-team deltas into the league table with one
+    index-aligned add."""
+    # set_index returns a fresh frame over shared column buffers; every write
+    # below replaces whole columns, so nothing leaks back into df — no deep
+    # copy of the untouched columns needed.
+    # (team is stripped once in load_dashboard, so index labels align with
+    # the stripped team names in the deltas frame without another .str pass.)
+    out = df.set_index("team")
+    cols = ["pts", "gf", "ga"]
+    out[cols] = out[cols].apply(pd.to_numeric, errors="coerce").fillna(0)
+    out[cols] = out[cols] + deltas.reindex(out.index, fill_value=0)
+    return out.reset_index()
+
+
+def _stats_lut(stats: list[dict]) -> pd.DataFrame | None:
+    """Build the event_id -> (home_xg, away_xg) lookup table from StatsMin
+    records, deduped keep-last. Returns None if nothing usable was uploaded."""
+    if not stats:
+        return None
+    lut = pd.DataFrame(stats)
+    if not {"event_id", "home_xg", "away_xg"}.issubset(lut.columns):
+        return None
+    lut = lut[["event_id", "home_xg", "away_xg"]]
+    # Coerce before deduping: mixed-type ids (123 vs "123") would otherwise
+    # both survive drop_duplicates and fan out the left merge downstream.
+    lut["event_id"] = pd.to_numeric(lut["event_id"], errors="coerce")
+    return lut.dropna(subset=["event_id"]).drop_duplicates("event_id", keep="last")
+
+
+def _apply_statsmin_to_fixtures(fixtures: pd.DataFrame, lut: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill xg_for/xg_against on fixture rows from the prebuilt StatsMin lookup
+    table. One hash merge on event_id plus an np.where select on venue
+    replaces the per-event double mask scan.
+    """
+    if "event_id" not in fixtures.columns:
+        return fixtures
+
+    # Shallow copy: only xg_for/xg_against are written, and always as whole
+    # new columns, so the other fixture columns keep sharing buffers.
+    out = fixtures.copy(deep=False)
+    for c in ("xg_for", "xg_against"):
+        if c not in out.columns:
+            out[c] = np.nan
+
+    merged = pd.DataFrame({"event_id": pd.to_numeric(out["event_id"], errors="coerce")}).merge(
+        lut, on="event_id", how="left"
+    )
+    # venue is normalized to bare H/A in load_fixtures, so this is a plain
+    # categorical equality check.
+    is_home = (out["venue"] == "H").to_numpy()
+    home_xg = merged["home_xg"].to_numpy(dtype=float)
+    away_xg = merged["away_xg"].to_numpy(dtype=float)
+    new_for = np.where(is_home, home_xg, away_xg)
+    new_against = np.where(is_home, away_xg, home_xg)
+
+    mask = ~np.isnan(new_for)
+    out["xg_for"] = np.where(mask, new_for, pd.to_numeric(out["xg_for"], errors="coerce").to_numpy())
+    out["xg_against"] = np.where(mask, new_against, pd.to_numeric(out["xg_against"], errors="coerce").to_numpy())
+    return out
+
 
 # -------------------------
-# Power Ranking page
+# Cached renderers
 # -------------------------
-if page == "Power Ranking":
-    st.markdown('<div class="section-title">SPL Power Ranking</div>', unsafe_allow_html=True)
-
-    df = load_dashboard()
-    if df is None:
-        st.warning("No dashboard output found. Run the Spark export first.")
-        st.stop()
+# Both take (path, mtime) as cache keys and thread them into the loaders, so
+# a new Spark export bumps the part file's mtime, reloads the frame and
+# invalidates the cached HTML; otherwise reruns get the prebuilt string back
+# in O(1).
+@st.cache_data(show_spinner=False)
+def render_power_table(fp: str, mtime: int, deltas: pd.DataFrame | None = None) -> str:
+    df = load_dashboard(fp, mtime).copy(deep=False)
 
     # numeric casting for expected columns
-    for c in ["pts", "spi", "exp_pts_mc", "win_league_pct", "make_acl_pct"]:
-        df = safe_num(df, c)
-
-    # Sort by current league position (points, GD, GF)
-    if {"pts", "gf", "ga"}.issubset(set(df.columns)):
-        df["gd"] = pd.to_numeric(df["gf"], errors="coerce").fillna(0) - pd.to_numeric(df["ga"], errors="coerce").fillna(0)
-        df = df.sort_values(["pts", "gd", "gf"], ascending=[False, False, False])
-    elif "pts" in df.columns:
-        df = df.sort_values("pts", ascending=False)
+    df = safe_num(df, ["pts", "spi", "exp_pts_mc", "win_league_pct", "make_acl_pct"])
+
+    # The Spark export already orders by league position (pts, GD, GF),
+    # so rows can be numbered as-is — no sort at render time. Uploaded demo
+    # events change pts/gf/ga though, so that branch re-ranks locally.
+    # Skip the deltas entirely when the export is missing any of the columns
+    # the add needs — degrade like the rest of the column checks here.
+    if deltas is not None and {"team", "pts", "gf", "ga"}.issubset(df.columns):
+        df = _apply_eventmin_updates(df, deltas)
+        # pts/gf/ga come back numeric and NaN-filled from
+        # _apply_eventmin_updates — no re-coercion needed here
+        df["gd"] = df["gf"] - df["ga"]
+        # np.lexsort ranks the ~dozen-row table in one shot; keys are
+        # listed least-significant first, negated for descending order.
+        order = np.lexsort(
+            (-df["gf"].to_numpy(), -df["gd"].to_numpy(), -df["pts"].to_numpy())
+        )
+        df = df.iloc[order]
 
     # Add league position (1, 2, 3, ...)
     df["league_pos"] = range(1, len(df) + 1)
@@ -169,12 +423,12 @@ if page == "Power Ranking":
             "win_league_pct": "Win League (%)",
             "make_acl_pct": "Make ACL Top 2 (%)",
         }
-    ).copy()
+    )  # rename already returns a new frame; no extra copy
 
-    # Convert pct columns to 0-100 if needed
+    # Convert pct columns to 0-100 if needed (one ufunc pass per column)
     for c in ["Win League (%)", "Make ACL Top 2 (%)"]:
         if c in df_show.columns:
-            df_show[c] = df_show[c].apply(lambda x: to_pct(x) if pd.notna(x) else None)
+            df_show[c] = to_pct_vec(df_show[c])
 
     # Keep a clean column order
     preferred = [
@@ -198,122 +452,127 @@ if page == "Power Ranking":
         if c in df_show.columns:
             df_show[c] = pd.to_numeric(df_show[c], errors="coerce").round(0)
 
-    # Display as compact HTML table
-    def fmt(v):
-        if pd.isna(v):
-            return ""
-        return str(v)
-
-    header = "".join([f"<th>{c}</th>" for c in df_show.columns])
-
-    rows_html = []
-    for _, r in df_show.iterrows():
-        tds = []
-        for c in df_show.columns:
-            v = r[c]
-            cls = "right" if c != "Club" else ""
-
-            if c.endswith("(%)") and pd.notna(v):
-                v = f"{float(v):.0f}%"
-            elif c in ["Pos", "Current Pts", "Power Index", "Expected Final Pts"] and pd.notna(v):
-                v = f"{float(v):.0f}"
+    # Styler renders the whole table in one pass: format strings instead of
+    # per-cell Python callables, and a prebuilt class frame puts .right on
+    # every cell except the Club column.
+    int_like = {"Pos", "Current Pts", "Power Index", "Expected Final Pts"}
+    fmt = {c: "{:.0f}%" for c in df_show.columns if c.endswith("(%)")}
+    fmt.update({c: "{:.0f}" for c in df_show.columns if c in int_like})
+    # Float columns the dict doesn't cover (pass-through export columns)
+    # would otherwise hit Styler's 6-decimal default; {:g} keeps them as
+    # compact as the old str(v) rendering (55.3, not 55.300000).
+    fmt.update(
+        {
+            c: "{:g}"
+            for c in df_show.columns
+            if c not in fmt and pd.api.types.is_float_dtype(df_show[c])
+        }
+    )
 
-            tds.append(f'<td class="{cls}">{fmt(v)}</td>')
-        rows_html.append("<tr>" + "".join(tds) + "</tr>")
+    classes = pd.DataFrame("right", index=df_show.index, columns=df_show.columns)
+    if "Club" in classes.columns:
+        classes["Club"] = ""
 
-    st.markdown(
-        f"""
-<div class="table-wrap">
-  <table>
-    <thead><tr>{header}</tr></thead>
-    <tbody>
-      {''.join(rows_html)}
-    </tbody>
-  </table>
-</div>
-""",
-        unsafe_allow_html=True,
+    styler = (
+        df_show.style.format(fmt, na_rep="")
+        .hide(axis="index")
+        .set_td_classes(classes)
     )
+    return f'<div class="table-wrap">{styler.to_html(border=0)}</div>'
 
-# -------------------------
-# Fixtures page
-# -------------------------
-else:
-    st.markdown('<div class="section-title">Remaining Fixtures — Match Level W/D/L</div>', unsafe_allow_html=True)
 
-    fixtures = load_fixtures()
-    if fixtures is None:
-        st.info("No fixture output found. Run the Spark export first.")
-        st.stop()
+@st.cache_data(show_spinner=False)
+def group_fixtures_by_team(fp: str, mtime: int) -> dict[str, pd.DataFrame]:
+    """
+    team -> that team's fixture rows. Built once per export so selecting a
+    team is a dict lookup instead of a full-column equality scan per rerun.
+    """
+    fixtures = load_fixtures(fp, mtime).copy(deep=False)
 
     # numeric columns
-    for c in ["p_win", "p_draw", "p_loss", "exp_pts", "xg_for", "xg_against"]:
-        fixtures = safe_num(fixtures, c)
+    fixtures = safe_num(fixtures, ["p_win", "p_draw", "p_loss", "exp_pts", "xg_for", "xg_against"])
 
-    if "team" not in fixtures.columns:
-        st.error("Fixtures file must contain a `team` column (team-opponent rows).")
-        st.stop()
+    # Parse + sort by match_date once here so every team's group is already
+    # in kickoff order and the render path never re-sorts. The export writes
+    # plain %Y-%m-%d, so pin the format to hit the fast C parser instead of
+    # per-value dateutil inference.
+    fixtures["match_date"] = pd.to_datetime(fixtures["match_date"], format="%Y-%m-%d", errors="coerce")
+    fixtures = fixtures.sort_values("match_date", ascending=True)
 
-    teams = sorted(fixtures["team"].dropna().astype(str).unique().tolist())
-    selected_team = st.selectbox("Select team", teams, index=0)
+    return {str(k): g for k, g in fixtures.groupby("team", observed=True)}
 
-    team_df = fixtures[fixtures["team"].astype(str) == str(selected_team)].copy()
 
-    # Parse + sort by match_date (assume it exists)
-    team_df["match_date"] = pd.to_datetime(team_df["match_date"], errors="coerce")
-    team_df = team_df.sort_values("match_date", ascending=True)
+@st.cache_data(show_spinner=False)
+def fixture_teams(fp: str, mtime: int) -> list[str]:
+    """Sorted team names for the selectbox; depends only on the export file."""
+    return sorted(group_fixtures_by_team(fp, mtime).keys())
 
-    st.markdown(
-        """
-<div class="smallmuted" style="margin-top:6px; margin-bottom:4px;">
-Each row is a future match for the selected club, with Win/Draw/Loss probabilities and expected points.
-</div>
-""",
-        unsafe_allow_html=True,
-    )
 
-    # Required columns
-    missing = [c for c in ["opponent", "venue", "p_win", "p_draw", "p_loss", "exp_pts"] if c not in team_df.columns]
-    if missing:
-        st.error(f"Fixtures output is missing columns: {missing}")
-        st.stop()
+@st.cache_data(show_spinner=False)
+def render_fixture_cards(fp: str, mtime: int, selected_team: str, stats_lut: pd.DataFrame | None = None) -> list[str]:
+    # No .copy() needed: st.cache_data already hands back a fresh copy of the
+    # grouped dict on every retrieval.
+    team_df = group_fixtures_by_team(fp, mtime).get(str(selected_team))
+    if team_df is None:
+        return []
+
+    if stats_lut is not None:
+        team_df = _apply_statsmin_to_fixtures(team_df, stats_lut)
+
+    # Make sure optional columns exist so tuple rows always carry every field
+    for c in ("xg_for", "xg_against"):
+        if c not in team_df.columns:
+            team_df[c] = float("nan")
+
+    # Probabilities as normalized 0-100 numpy arrays, computed once for all rows
+    pw_arr = to_pct_vec(team_df["p_win"]).fillna(0.0).to_numpy()
+    pdw_arr = to_pct_vec(team_df["p_draw"]).fillna(0.0).to_numpy()
+    pl_arr = to_pct_vec(team_df["p_loss"]).fillna(0.0).to_numpy()
+    tot = np.maximum(pw_arr + pdw_arr + pl_arr, 1e-9)
+    pw_arr, pdw_arr, pl_arr = pw_arr / tot * 100, pdw_arr / tot * 100, pl_arr / tot * 100
+    bars = prob_bars(pw_arr, pdw_arr, pl_arr)
+
+    # Pull every column the loop touches into a plain numpy array once —
+    # integer indexing below never goes through pandas Series machinery.
+    opp_arr = team_df["opponent"].to_numpy()
+    venue_raw = team_df["venue"].astype("string")
+    venue_txt_arr = venue_raw.map(VENUE_MAP).fillna(venue_raw).to_numpy()
+    date_strs = team_df["match_date"].dt.strftime("%Y-%m-%d").fillna("").to_numpy()
+    exp_arr = team_df["exp_pts"].to_numpy()
+    xgf_arr = team_df["xg_for"].to_numpy()
+    xga_arr = team_df["xg_against"].to_numpy()
+
+    # NaN checks vectorized once: the loop indexes plain booleans instead of
+    # dispatching into pd.isna/pd.notna per row.
+    exp_nan = team_df["exp_pts"].isna().to_numpy()
+    xg_ok = (team_df["xg_for"].notna() & team_df["xg_against"].notna()).to_numpy()
 
     # Render fixture cards
-    for _, r in team_df.iterrows():
-        opp = r.get("opponent", "")
-        venue = r.get("venue", "")
-        match_date = r["match_date"].strftime("%Y-%m-%d") if pd.notna(r["match_date"]) else ""
-        pw, pdw, pl = r.get("p_win", None), r.get("p_draw", None), r.get("p_loss", None)
-        exp_pts = r.get("exp_pts", None)
+    cards = []
+    for i in range(len(team_df)):
+        opp = opp_arr[i]
+        venue_txt = venue_txt_arr[i]
+        match_date = date_strs[i]
+        exp_pts = exp_arr[i]
 
-        pwp = to_pct(pw) or 0.0
-        pdwp = to_pct(pdw) or 0.0
-        plp = to_pct(pl) or 0.0
+        pwp = pw_arr[i]
+        pdwp = pdw_arr[i]
+        plp = pl_arr[i]
 
         # xG line (no indentation -> renders as HTML)
-        xg_for = r.get("xg_for", None)
-        xg_against = r.get("xg_against", None)
         xg_line = ""
-        if "xg_for" in team_df.columns and "xg_against" in team_df.columns:
-            if pd.notna(xg_for) and pd.notna(xg_against):
-                xg_line = (
-                    f'<div class="smallmuted">'
-                    f'xG {float(xg_for):.2f} – {float(xg_against):.2f}'
-                    f'</div>'
-                )
+        if xg_ok[i]:
+            xg_line = (
+                f'<div class="smallmuted">'
+                f'xG {float(xgf_arr[i]):.2f} – {float(xga_arr[i]):.2f}'
+                f'</div>'
+            )
 
         title = f"{selected_team} vs {opp}"
-        # Pretty venue
-        venue_txt = venue
-        if isinstance(venue, str):
-            if venue.upper() == "H":
-                venue_txt = "Home"
-            elif venue.upper() == "A":
-                venue_txt = "Away"
 
-        exp_txt = "" if pd.isna(exp_pts) else f"{float(exp_pts):.2f}"
+        exp_txt = "" if exp_nan[i] else f"{float(exp_pts):.2f}"
 
-        st.markdown(
+        cards.append(
             f"""
 <div class="rowcard">
   <div class="smallmuted">{match_date} • {venue_txt}</div>
@@ -321,7 +580,7 @@ Each row is a future match for the selected club, with Win/Draw/Loss probabiliti
   {xg_line}
 
   <div style="display:flex; gap:14px; align-items:center; margin-top:8px;">
-    {prob_bar(pw, pdw, pl)}
+    {bars[i]}
     <div class="smallmuted" style="min-width:220px;">
       Win {pwp:.0f}% • Draw {pdwp:.0f}% • Loss {plp:.0f}%
     </div>
@@ -332,8 +591,87 @@ Each row is a future match for the selected club, with Win/Draw/Loss probabiliti
     </div>
   </div>
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
+
+    return cards
+
+
+# -------------------------
+# Sidebar navigation
+# -------------------------
+page = st.sidebar.radio("View", ["Power Ranking", "Fixtures"], index=0)
+
+# Demo inputs: EventMin JSON files in the same minified schema the listener
+# drops into data/stream_in/event (see test_files/events/ for samples).
+uploaded_events = st.sidebar.file_uploader(
+    "Demo: EventMin JSON",
+    type="json",
+    accept_multiple_files=True,
+    key="upload_events",
+)
+uploaded_stats = st.sidebar.file_uploader(
+    "Demo: StatsMin JSON",
+    type="json",
+    accept_multiple_files=True,
+    key="upload_stats",
+)
+
+# -------------------------
+# Power Ranking page
+# -------------------------
+if page == "Power Ranking":
+    st.markdown('<div class="section-title">SPL Power Ranking</div>', unsafe_allow_html=True)
+
+    dash_fp = _data_file(DASH_PARQUET_FILE, DASH_PARQUET_DIR, DASH_DIR)
+    if dash_fp is None:
+        st.warning("No dashboard output found. Run the Spark export first.")
+        st.stop()
+
+    demo_deltas = _cached_upload_frame("demo_events_agg", uploaded_events, _event_deltas)
+    table_html = render_power_table(str(dash_fp), dash_fp.stat().st_mtime_ns, demo_deltas)
+    st.markdown(table_html, unsafe_allow_html=True)
+
+# -------------------------
+# Fixtures page
+# -------------------------
+else:
+    st.markdown('<div class="section-title">Remaining Fixtures — Match Level W/D/L</div>', unsafe_allow_html=True)
+
+    fixture_fp = _data_file(FIXTURE_PARQUET_FILE, FIXTURE_PARQUET_DIR, FIXTURE_DIR)
+    if fixture_fp is None:
+        st.info("No fixture output found. Run the Spark export first.")
+        st.stop()
+
+    fixture_mtime = fixture_fp.stat().st_mtime_ns
+    fixtures = load_fixtures(str(fixture_fp), fixture_mtime)
+
+    if "team" not in fixtures.columns:
+        st.error("Fixtures file must contain a `team` column (team-opponent rows).")
+        st.stop()
+
+    # Required columns
+    missing = [c for c in ["opponent", "venue", "p_win", "p_draw", "p_loss", "exp_pts"] if c not in fixtures.columns]
+    if missing:
+        st.error(f"Fixtures output is missing columns: {missing}")
+        st.stop()
+    teams = fixture_teams(str(fixture_fp), fixture_mtime)
+    selected_team = st.selectbox("Select team", teams, index=0)
+
+    st.markdown(
+        """
+<div class="smallmuted" style="margin-top:6px; margin-bottom:4px;">
+Each row is a future match for the selected club, with Win/Draw/Loss probabilities and expected points.
+</div>
+""",
+        unsafe_allow_html=True,
+    )
+
+    # One markdown element for all cards: one ForwardMsg + one client-side
+    # render instead of a round trip per fixture row.
+    demo_lut = _cached_upload_frame("demo_stats_lut", uploaded_stats, _stats_lut)
+    cards = render_fixture_cards(str(fixture_fp), fixture_mtime, str(selected_team), demo_lut)
+    if cards:
+        st.markdown("".join(cards), unsafe_allow_html=True)
 st.markdown("<div style='height:220px;'></div>", unsafe_allow_html=True)
 
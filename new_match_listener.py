@@ -1,14 +1,17 @@
-import json
+import asyncio
+import mmap
 import os
 import re
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+
+from sofascore_parsers import parse_event_min, parse_stats_min
 
 
 # -----------------------------
@@ -16,6 +19,15 @@ from selenium.webdriver.common.by import By
 # -----------------------------
 CSV_PATH = Path("data/spl_match_links_merged.csv")
 
+# Known columns of spl_match_links_merged.csv; dtype keys for columns that
+# are absent in a given file are simply ignored by read_csv.
+CSV_DTYPES = {
+    "season_id": "Int32",
+    "event_id": "Int64",
+    "match_url": "string",
+    "is_future_fixture": "Int8",
+}
+
 STREAM_EVENT_DIR = Path("data/stream_in/event")
 STREAM_STATS_DIR = Path("data/stream_in/stats")
 
@@ -24,8 +36,20 @@ STATS_URL = "https://www.sofascore.com/api/v1/event/{event_id}/statistics"
 
 FINISHED_STATUS_CODE = 100
 
-MAX_WAIT_SECONDS = 12
-SLEEP_SECONDS = 0.15
+REQUEST_TIMEOUT = 10
+CONCURRENCY = 8  # simultaneous in-flight requests against the API
+RATE_PER_SEC = 10  # request budget across all workers
+MAX_RETRIES = 3  # attempts per URL when the server asks us to back off
+FLUSH_EVERY = 50  # flips to accumulate before patching them to disk
+RUN_STAMP = time.strftime("%Y%m%d_%H%M%S")  # one rollup file per run
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "application/json",
+}
 
 FORCE = os.environ.get("FORCE", "0") == "1"
 
@@ -40,30 +64,125 @@ def ensure_dirs() -> None:
     STREAM_STATS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False)
-    tmp.replace(path)
+def patch_flags_zero(path: Path, rows: list) -> list:
+    """
+    Flip is_future_fixture from '1' to '0' in place for the given 0-based
+    data row numbers. The flag is the last, single-character field of each
+    line, so every flip is one byte written through mmap instead of a full
+    CSV rewrite. Rows whose line is missing or doesn't end with ",1" are
+    returned (the caller falls back to a full rewrite for those); a row
+    already ending with ",0" counts as patched.
+    """
+    failed = []
+    try:
+        with open(path, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), 0)
+            try:
+                # scan a copy for the newline offsets: a numpy view of the
+                # mmap itself would keep an exported pointer alive and make
+                # mm.close() raise BufferError
+                buf = np.frombuffer(bytes(mm), dtype=np.uint8)
+                ends = np.where(buf == 10)[0]  # newline offsets, one per line
+                for r in rows:
+                    line_no = r + 1  # line 0 is the header
+                    if line_no >= len(ends):
+                        failed.append(r)
+                        continue
+                    end = int(ends[line_no])
+                    if mm[end - 1] == 13:  # tolerate \r\n
+                        end -= 1
+                    if mm[end - 2 : end] == b",1":
+                        mm[end - 1 : end] = b"0"
+                    elif mm[end - 2 : end] != b",0":
+                        failed.append(r)
+                mm.flush()
+            finally:
+                mm.close()
+    except (OSError, ValueError):
+        # could not map, address or flush the file itself — treat every row
+        # as unpatched
+        return list(rows)
+    return failed
 
 
 def write_csv_atomic(path: Path, df: pd.DataFrame) -> None:
     tmp = path.with_suffix(path.suffix + ".tmp")
-    df.to_csv(tmp, index=False)
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        # arrow's writer serializes in C (and releases the GIL); keep
+        # df.to_csv as the fallback so the flush never fails on a frame
+        # arrow cannot convert.
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), tmp)
+    except Exception:
+        df.to_csv(tmp, index=False)
     tmp.replace(path)
 
 
-def out_paths(event_id: int) -> Tuple[Path, Path]:
-    ts = int(time.time() * 1000)
-    event_out = STREAM_EVENT_DIR / f"event_{event_id}_{ts}.json"
-    stats_out = STREAM_STATS_DIR / f"stats_{event_id}_{ts}.json"
+def rollup_paths() -> Tuple[Path, Path]:
+    # One fresh rollup per run, not per day: Spark's file stream source
+    # treats a file as immutable once listed, so while Load.ipynb's
+    # readStream is running it would pick up a shared daily file seconds
+    # after its first record and silently drop every later append.
+    event_out = STREAM_EVENT_DIR / f"events_{RUN_STAMP}.jsonl"
+    stats_out = STREAM_STATS_DIR / f"stats_{RUN_STAMP}.jsonl"
     return event_out, stats_out
 
 
-def already_backfilled(event_id: int) -> bool:
-    has_event = any(STREAM_EVENT_DIR.glob(f"event_{event_id}_*.json"))
-    has_stats = any(STREAM_STATS_DIR.glob(f"stats_{event_id}_*.json"))
-    return has_event and has_stats
+def append_jsonl(path: Path, payload: Dict[str, Any]) -> None:
+    # One O_APPEND write per record, instead of a create+rename per event.
+    # Appends land in a dot-prefixed sibling (hidden files are ignored by
+    # Spark's file source) and publish_rollups renames it into place once
+    # this run stops writing, so the stream never lists a file that is
+    # still growing.
+    tmp = path.with_name("." + path.name)
+    with tmp.open("ab") as f:
+        f.write(orjson.dumps(payload) + b"\n")
+
+
+def publish_rollups() -> None:
+    # Atomically expose this run's rollups to the stream. Same-directory
+    # rename, so a file is either absent or complete from Spark's side.
+    for path in rollup_paths():
+        tmp = path.with_name("." + path.name)
+        if tmp.exists():
+            tmp.replace(path)
+
+
+def scan_done_ids(folder: Path, prefix: str) -> set:
+    """
+    Collect event ids already backfilled: event_id fields from the
+    run-stamped {prefix}*.jsonl rollups, plus the ids embedded in any legacy
+    per-event {prefix}_{event_id}_{ts}.json names. One directory listing
+    instead of a glob per fixture.
+    """
+    done = set()
+    # os.scandir yields names straight from the directory entries — no
+    # Path object or extra stat() per file like Path.iterdir/glob
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith(prefix):
+                continue
+            if name.endswith(".jsonl"):
+                try:
+                    for line in Path(entry.path).read_bytes().splitlines():
+                        if not line:
+                            continue
+                        eid = orjson.loads(line).get("event_id")
+                        if eid is not None:
+                            done.add(int(eid))
+                except Exception:
+                    pass
+            elif name.endswith(".json"):
+                parts = name.split("_")
+                if len(parts) >= 3:
+                    try:
+                        done.add(int(parts[1]))
+                    except ValueError:
+                        pass
+    return done
 
 
 # -----------------------------
@@ -78,29 +197,71 @@ def normalize_flag_series(s: pd.Series) -> pd.Series:
     - "true"/"false"
     """
     if s.dtype == bool:
-        return s.astype(int)
+        return s.astype("int8")
+
+    # already numeric (e.g. read with the Int8 dtype hint) -> no string work
+    if pd.api.types.is_numeric_dtype(s):
+        return (s.fillna(0) != 0).astype("int8")
+
+    # strings / mixed -> one hashed isin pass instead of a per-element map
+    ss = s.astype("string").str.strip().str.lower()
+    return ss.isin(("1", "true", "t", "yes", "y")).astype("int8")
+
 
-    # strings / mixed -> normalize
-    ss = s.astype(str).str.strip().str.lower()
-    return ss.map(lambda x: 1 if x in ("1", "true", "t", "yes", "y") else 0)
+ID_COLUMNS = ("event_id", "eventid", "sofascore_event_id")
+
+
+def extract_event_ids(future_df: pd.DataFrame) -> pd.Series:
+    """
+    Vectorized event-id extraction for all future rows at once: prefer an
+    explicit id column, then sweep string columns with one compiled-regex
+    str.extract each to fill any gaps. Returns a nullable Int64 Series
+    aligned with future_df; rows it cannot resolve stay NA.
+    """
+    eids = pd.Series(pd.NA, index=future_df.index, dtype="Int64")
+
+    for col in future_df.columns:
+        if str(col).lower() in ID_COLUMNS:
+            eids = pd.to_numeric(future_df[col], errors="coerce").astype("Int64")
+            break
+
+    if eids.isna().any():
+        for col in future_df.columns:
+            if str(col).lower() in ID_COLUMNS:
+                continue
+            s = future_df[col]
+            if s.dtype != object and not pd.api.types.is_string_dtype(s):
+                continue
+            found = pd.to_numeric(
+                s.astype("string").str.extract(EVENT_ID_RE, expand=False),
+                errors="coerce",
+            ).astype("Int64")
+            eids = eids.fillna(found)
+            if not eids.isna().any():
+                break
+
+    return eids
 
 
 def extract_event_id_from_row(row: pd.Series) -> Optional[int]:
     # Prefer explicit event_id column if present
     for col in row.index:
-        if str(col).lower() in ("event_id", "eventid", "sofascore_event_id"):
+        if str(col).lower() in ID_COLUMNS:
             try:
                 v = int(float(row[col]))
                 return v
             except Exception:
                 pass
 
-    # Else regex scan all cells
+    # Else regex scan all cells; bind the method once to skip the attribute
+    # lookup per cell (this path only runs for rows the vectorized
+    # extract_event_ids sweep could not resolve)
+    search = EVENT_ID_RE.search
     for col in row.index:
         v = row[col]
         if pd.isna(v):
             continue
-        m = EVENT_ID_RE.search(str(v))
+        m = search(v if isinstance(v, str) else str(v))
         if m:
             return int(m.group(1))
 
@@ -108,114 +269,127 @@ def extract_event_id_from_row(row: pd.Series) -> Optional[int]:
 
 
 # -----------------------------
-# Selenium helpers
+# HTTP helpers
 # -----------------------------
-def build_driver() -> webdriver.Chrome:
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--window-size=1400,900")
-    opts.add_argument("--disable-dev-shm-usage")
-    driver = webdriver.Chrome(options=opts)
-    driver.set_page_load_timeout(60)
-    return driver
-
-
-def read_json_from_page(driver) -> Optional[Dict[str, Any]]:
+class RateLimiter:
     """
-    API endpoint returns JSON, usually displayed in <pre> or body text.
-    Poll until JSON parses or timeout.
+    Minimal async token bucket: grants RATE_PER_SEC acquisitions per second
+    across all workers and sleeps only when the bucket is actually empty —
+    unlike a fixed sleep per request, full speed is kept while under budget.
     """
-    t0 = time.time()
-    last_txt = ""
 
-    while time.time() - t0 < MAX_WAIT_SECONDS:
-        try:
-            pre = driver.find_elements(By.TAG_NAME, "pre")
-            if pre:
-                txt = pre[0].text.strip()
-            else:
-                txt = driver.find_element(By.TAG_NAME, "body").text.strip()
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
 
-            if txt:
-                last_txt = txt
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
 
-            try:
-                return json.loads(last_txt)
-            except Exception:
-                time.sleep(0.3)
-        except Exception:
-            time.sleep(0.3)
 
-    try:
-        return json.loads(last_txt)
-    except Exception:
-        return None
+rate_limiter = RateLimiter(RATE_PER_SEC)
 
 
-def get_status_code(event_json: Dict[str, Any]) -> Optional[int]:
-    try:
-        return event_json.get("event", {}).get("status", {}).get("code")
-    except Exception:
-        return None
+def build_client() -> httpx.AsyncClient:
+    # HTTP/2 multiplexes all event/stats GETs over a few kept-alive
+    # connections, so the TLS handshake is paid once, not per fixture.
+    return httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=CONCURRENCY),
+    )
 
 
-# -----------------------------
-# Parsers (min schema for Spark)
-# -----------------------------
-def parse_event_min(ev_json: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+async def fetch_json(client: httpx.AsyncClient, url: str) -> Optional[Dict[str, Any]]:
     """
-    Convert SofaScore event payload -> the schema expected by Load.ipynb:
-      event_id, season_year, home_team, away_team, home_score, away_score, status_code, start_timestamp
+    The API endpoints return application/json directly — one GET, no DOM.
+    Rate-limited through the shared token bucket; 429/503 responses back
+    off for the server's Retry-After (doubling when absent) before retrying.
     """
-    try:
-        ev = ev_json["event"]
-        return {
-            "event_id": ev["id"],
-            "season_year": ev["season"]["year"],
-            "home_team": ev["homeTeam"]["name"],
-            "away_team": ev["awayTeam"]["name"],
-            "home_score": ev["homeScore"]["current"],
-            "away_score": ev["awayScore"]["current"],
-            "status_code": ev["status"]["code"],
-            "start_timestamp": ev["startTimestamp"],
-        }
-    except Exception:
-        return None
-
-
-def _to_float(x: Any) -> Optional[float]:
-    if isinstance(x, (int, float)):
-        return float(x)
-    if isinstance(x, str):
+    backoff = 1.0
+    for _ in range(MAX_RETRIES):
+        await rate_limiter.acquire()
+        try:
+            resp = await client.get(url)
+        except Exception:
+            return None
+        if resp.status_code in (429, 503):
+            try:
+                delay = float(resp.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                delay = backoff
+            await asyncio.sleep(delay)
+            backoff *= 2
+            continue
         try:
-            return float(x.replace("%", "").strip())
+            resp.raise_for_status()
+            # orjson parses the raw bytes directly — no Python-level decode
+            # of the 30-100KB payload first
+            return orjson.loads(resp.content)
         except Exception:
             return None
     return None
 
 
-def parse_stats_min(stats_json: Dict[str, Any], event_id: int) -> Optional[Dict[str, Any]]:
+async def fetch_one(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, row_idx: int, eid: int
+) -> Tuple[int, int, str]:
     """
-    Convert SofaScore stats payload -> the schema expected by Load.ipynb:
-      event_id, home_xg, away_xg
+    Fetch event (and, if finished, stats) for one fixture and write the
+    minified payloads. Returns (row_idx, eid, outcome) where outcome is one
+    of "no_event", "unfinished", "no_stats", "written", "written_no_xg".
     """
-    try:
-        home_xg = None
-        away_xg = None
-
-        groups = stats_json["statistics"][0]["groups"]
-        for g in groups:
-            for it in g.get("statisticsItems", []):
-                if it.get("key") == "expectedGoals":
-                    home_xg = _to_float(it.get("homeValue"))
-                    away_xg = _to_float(it.get("awayValue"))
-                    break
-            if home_xg is not None:
-                break
+    async with sem:
+        # pacing comes from the shared token bucket inside fetch_json — no
+        # blanket sleep per request
+        ev_json = await fetch_json(client, EVENT_URL.format(event_id=eid))
+
+        if ev_json is None:
+            return row_idx, eid, "no_event"
+
+        if get_status_code(ev_json) != FINISHED_STATUS_CODE:
+            # still future / not ended -> keep flag as is_future_fixture=1
+            return row_idx, eid, "unfinished"
+
+        # some matches never publish xG; the event payload says so, so don't
+        # pay the stats round trip just to parse out two Nones
+        has_xg = bool(ev_json.get("event", {}).get("hasXg", True))
+        st_json = None
+        if has_xg:
+            st_json = await fetch_json(client, STATS_URL.format(event_id=eid))
+
+    ev_min = parse_event_min(ev_json)
+    if has_xg:
+        if st_json is None:
+            return row_idx, eid, "no_stats"
+        st_min = parse_stats_min(st_json, eid)
+    else:
+        st_min = {"event_id": int(eid), "home_xg": None, "away_xg": None}
+    if ev_min is None or st_min is None:
+        return row_idx, eid, "no_stats"
+
+    event_out, stats_out = rollup_paths()
+    # Disk writes go through a thread so they never stall the fetch loop;
+    # each append is a single O_APPEND write, safe across workers.
+    await asyncio.to_thread(append_jsonl, event_out, ev_min)
+    await asyncio.to_thread(append_jsonl, stats_out, st_min)
+    return row_idx, eid, "written" if has_xg else "written_no_xg"
+
 
-        return {"event_id": int(event_id), "home_xg": home_xg, "away_xg": away_xg}
+def get_status_code(event_json: Dict[str, Any]) -> Optional[int]:
+    try:
+        return event_json.get("event", {}).get("status", {}).get("code")
     except Exception:
         return None
 
@@ -223,13 +397,18 @@ def parse_stats_min(stats_json: Dict[str, Any], event_id: int) -> Optional[Dict[
 # -----------------------------
 # Main logic
 # -----------------------------
-def main() -> None:
+async def main() -> None:
     ensure_dirs()
 
     if not CSV_PATH.exists():
         raise FileNotFoundError(f"CSV not found: {CSV_PATH}")
 
-    df = pd.read_csv(CSV_PATH)
+    try:
+        df = pd.read_csv(CSV_PATH, dtype=CSV_DTYPES, engine="c")
+    except (TypeError, ValueError):
+        # e.g. a flag column written as "true"/"false" text -> let pandas
+        # infer and normalize_flag_series sort it out
+        df = pd.read_csv(CSV_PATH)
 
     if "is_future_fixture" not in df.columns:
         raise ValueError("spl_match_links_merged.csv must contain a column named 'is_future_fixture'.")
@@ -237,16 +416,38 @@ def main() -> None:
     # normalize to 0/1
     df["is_future_fixture"] = normalize_flag_series(df["is_future_fixture"])
 
-    # build a list of row indices for future fixtures only
-    future_idx = df.index[df["is_future_fixture"] == 1].tolist()
-    if not future_idx:
+    # future fixtures only
+    future_df = df[df["is_future_fixture"] == 1]
+
+    # A fixture whose kickoff is still ahead can only come back "not
+    # finished", so skip its round trip entirely when the CSV carries a
+    # start-timestamp column. The current merged CSV has none, in which
+    # case this is a no-op.
+    name_lc = {c: str(c).lower() for c in df.columns}
+    start_ts_col = next(
+        (c for c, lc in name_lc.items() if "start" in lc and ("time" in lc or lc.endswith("_ts"))),
+        None,
+    )
+    if start_ts_col is not None and not future_df.empty:
+        cutoff = int(time.time()) - 7200  # 2h margin for in-play -> finished
+        ts = pd.to_numeric(future_df[start_ts_col], errors="coerce")
+        not_started = (ts >= cutoff).fillna(False)
+        if not_started.any():
+            print(f"[INFO] skipping {int(not_started.sum())} fixtures with kickoff still ahead")
+            future_df = future_df[~not_started]
+
+    if future_df.empty:
         print("[INFO] No future fixtures flagged (is_future_fixture == 1). Nothing to do.")
         return
 
-    # extract event_id per future row
-    idx_and_eids = []
+    # extract event_id for all future rows in one vectorized sweep; the
+    # per-row cell scan only ever runs for rows the sweep could not resolve
+    eids = extract_event_ids(future_df)
+    ok = eids.notna()
+    idx_and_eids = list(zip(future_df.index[ok], eids[ok].astype(int)))
+
     missing = 0
-    for idx in future_idx:
+    for idx in future_df.index[~ok]:
         eid = extract_event_id_from_row(df.loc[idx])
         if eid is None:
             missing += 1
@@ -256,79 +457,84 @@ def main() -> None:
     if not idx_and_eids:
         raise ValueError("Could not extract any event_id from rows where is_future_fixture == 1.")
 
-    print(f"[INFO] future fixtures flagged: {len(future_idx)}")
+    print(f"[INFO] future fixtures flagged: {len(future_df)}")
     print(f"[INFO] extracted event_ids: {len(idx_and_eids)} (missing event_id in {missing} rows)")
 
-    driver = build_driver()
+    done_events = scan_done_ids(STREAM_EVENT_DIR, "event")
+    done_stats = scan_done_ids(STREAM_STATS_DIR, "stats")
+
+    client = build_client()
+    sem = asyncio.Semaphore(CONCURRENCY)
 
     written = 0
-    flipped = 0
     skipped_backfilled = 0
     finished_seen = 0
+    skipped_no_xg = 0
+    flipped_rows = []
+    pending_flips = []
 
     try:
-        # warm up session
-        driver.get("https://www.sofascore.com")
-        time.sleep(1.0)
+        # warm up session (picks up the Cloudflare cookie into the jar)
+        try:
+            await client.get("https://www.sofascore.com")
+        except Exception:
+            pass
 
-        for k, (row_idx, eid) in enumerate(idx_and_eids, start=1):
-            if (not FORCE) and already_backfilled(eid):
+        tasks = []
+        for row_idx, eid in idx_and_eids:
+            if (not FORCE) and eid in done_events and eid in done_stats:
                 skipped_backfilled += 1
                 continue
-
-            # 1) event json first
-            driver.get(EVENT_URL.format(event_id=eid))
-            ev_json = read_json_from_page(driver)
-            time.sleep(SLEEP_SECONDS)
-
-            if ev_json is None:
-                continue
-
-            if get_status_code(ev_json) != FINISHED_STATUS_CODE:
-                # still future / not ended -> keep flag as is_future_fixture=1
-                continue
-
-            finished_seen += 1
-
-            # 2) stats json (only if finished)
-            driver.get(STATS_URL.format(event_id=eid))
-            st_json = read_json_from_page(driver)
-            time.sleep(SLEEP_SECONDS)
-
-            if st_json is None:
-                continue
-
-            # 3) parse + write minified schema to streaming folders
-            ev_min = parse_event_min(ev_json)
-            st_min = parse_stats_min(st_json, eid)
-            if ev_min is None or st_min is None:
+            tasks.append(fetch_one(client, sem, row_idx, eid))
+
+        # Every event is independent: fan out up to CONCURRENCY requests at
+        # once instead of paying one RTT per event serially. Results are
+        # handled as they land so flips can be flushed mid-run.
+        for fut in asyncio.as_completed(tasks):
+            row_idx, eid, outcome = await fut
+            if outcome in ("no_stats", "written", "written_no_xg"):
+                finished_seen += 1
+            if outcome == "written_no_xg":
+                skipped_no_xg += 1
+            if outcome not in ("written", "written_no_xg"):
                 continue
-
-            event_out, stats_out = out_paths(eid)
-            write_json_atomic(event_out, ev_min)
-            write_json_atomic(stats_out, st_min)
             written += 1
-
-            # 4) flip flag in original csv row
-            if int(df.at[row_idx, "is_future_fixture"]) == 1:
-                df.at[row_idx, "is_future_fixture"] = 0
-                flipped += 1
-
-            if written % 20 == 0:
-                print(f"[INFO] written={written}, flipped={flipped}, scanned_future={k}/{len(idx_and_eids)}")
-
+            done_events.add(eid)
+            done_stats.add(eid)
+            # every task row came from the is_future_fixture == 1 slice, so
+            # it always needs flipping — just collect the index
+            flipped_rows.append(row_idx)
+            pending_flips.append(row_idx)
+
+            # make partial progress durable: every FLUSH_EVERY flips the
+            # affected bytes get patched to disk, so a crash mid-run loses
+            # at most one batch of flips. Rows a patch can't handle stay
+            # pending for the final fallback; later batches still flush.
+            if len(pending_flips) >= FLUSH_EVERY:
+                pending_flips = patch_flags_zero(CSV_PATH, pending_flips)
     finally:
-        driver.quit()
+        await client.aclose()
+        # publish even on a crash mid-run: whatever was written must reach
+        # the stream before (or with) the rows it flips to not-future
+        publish_rollups()
+
+    flipped = len(flipped_rows)
 
-    # Persist CSV updates if we flipped anything
+    # Persist remaining CSV updates: one vectorized assignment on the frame,
+    # then patch just the outstanding bytes in place — the whole file is
+    # rewritten only for rows whose lines the fixed-width ",1" patch could
+    # not handle.
     if flipped > 0:
-        write_csv_atomic(CSV_PATH, df)
+        df.loc[flipped_rows, "is_future_fixture"] = 0
+        if pending_flips and patch_flags_zero(CSV_PATH, pending_flips):
+            write_csv_atomic(CSV_PATH, df)
         print(f"[INFO] updated CSV (flipped {flipped} rows to is_future_fixture=0): {CSV_PATH}")
 
     print("[DONE]")
     print(f"  finished seen (status=100):  {finished_seen}")
     print(f"  written to stream folders:   {written}")
     print(f"  skipped (already backfilled): {skipped_backfilled}")
+    print(f"  stats fetch skipped (no xG):  {skipped_no_xg}")
     print(f"  event dir: {STREAM_EVENT_DIR}")
     print(f"  stats dir: {STREAM_STATS_DIR}")
     if FORCE:
@@ -336,4 +542,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
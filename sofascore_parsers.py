@@ -0,0 +1,65 @@
+"""
+Shared SofaScore payload parsers.
+
+Both new_match_listener.py and streaming_test.py reduce the raw API
+payloads to the minified schemas consumed by Load.ipynb; keeping the
+parsers here means one copy to maintain instead of two drifting ones.
+"""
+
+from typing import Any, Dict, Optional
+
+
+def parse_event_min(ev_json: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert SofaScore event payload -> the schema expected by Load.ipynb:
+      event_id, season_year, home_team, away_team, home_score, away_score, status_code, start_timestamp
+    """
+    try:
+        ev = ev_json["event"]
+        return {
+            "event_id": ev["id"],
+            "season_year": ev["season"]["year"],
+            "home_team": ev["homeTeam"]["name"],
+            "away_team": ev["awayTeam"]["name"],
+            "home_score": ev["homeScore"]["current"],
+            "away_score": ev["awayScore"]["current"],
+            "status_code": ev["status"]["code"],
+            "start_timestamp": ev["startTimestamp"],
+        }
+    except Exception:
+        return None
+
+
+def _to_float(x: Any) -> Optional[float]:
+    if isinstance(x, (int, float)):
+        return float(x)
+    if isinstance(x, str):
+        try:
+            return float(x.replace("%", "").strip())
+        except Exception:
+            return None
+    return None
+
+
+def parse_stats_min(stats_json: Dict[str, Any], event_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Convert SofaScore stats payload -> the schema expected by Load.ipynb:
+      event_id, home_xg, away_xg
+    """
+    try:
+        item = next(
+            (
+                it
+                for g in stats_json["statistics"][0]["groups"]
+                for it in g.get("statisticsItems", ())
+                if it.get("key") == "expectedGoals"
+            ),
+            None,
+        )
+        return {
+            "event_id": int(event_id),
+            "home_xg": _to_float(item.get("homeValue")) if item else None,
+            "away_xg": _to_float(item.get("awayValue")) if item else None,
+        }
+    except Exception:
+        return None